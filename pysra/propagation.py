@@ -293,10 +293,19 @@ class LinearElasticCalculator(AbstractCalculator):
             Site profile.
         """
 
+        # Complex properties of all layers. Frequency dependent properties
+        # have a column for each frequency.
+        comp_shear_mods = profile.comp_shear_mods()
+        comp_shear_vels = profile.comp_shear_vels(comp_shear_mods)
+
         # Compute the complex wave numbers of the system
-        wave_nums = np.empty((len(profile), len(angular_freqs)), np.complex)
-        for i, l in enumerate(profile):
-            wave_nums[i, :] = angular_freqs / l.comp_shear_vel
+        wave_nums = angular_freqs / comp_shear_vels
+
+        # Complex impedance between layers -- wave number can be zero which
+        # causes an error.
+        with np.errstate(invalid='ignore'):
+            imped = wave_nums * comp_shear_mods
+            cimpeds = imped[:-1] / imped[1:]
 
         # Compute the waves. In the top surface layer, the up-going and
         # down-going waves have an amplitude of 1 as they are completely
@@ -304,11 +313,7 @@ class LinearElasticCalculator(AbstractCalculator):
         waves_a = np.ones_like(wave_nums, np.complex)
         waves_b = np.ones_like(wave_nums, np.complex)
         for i, l in enumerate(profile[:-1]):
-            # Complex impedance -- wave number can be zero which causes an
-            # error.
-            with np.errstate(invalid='ignore'):
-                cimped = ((wave_nums[i] * l.comp_shear_mod) /
-                          (wave_nums[i + 1] * profile[i + 1].comp_shear_mod))
+            cimped = cimpeds[i]
 
             # Complex term to simplify equations -- uses full layer height
             cterm = 1j * wave_nums[i, :] * l.thickness
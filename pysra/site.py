@@ -22,10 +22,10 @@
 
 import collections
 
+import numba
 import numpy as np
 
 import scipy.constants
-from scipy.interpolate import interp1d
 
 from .motion import WaveField, GRAVITY
 
@@ -33,6 +33,123 @@ COMP_MODULUS_MODEL = 'dormieux'
 
 KPA_TO_ATM = scipy.constants.kilo / scipy.constants.atm
 
+# Default strains [decimal] of the empirical nonlinear curves. These are
+# shared by the soil types and therefore read-only.
+_DEFAULT_STRAINS = np.logspace(-6, -1.5, num=20)
+_DEFAULT_STRAINS.flags.writeable = False
+_DEFAULT_LN_STRAINS = np.log(_DEFAULT_STRAINS)
+_DEFAULT_LN_STRAINS.flags.writeable = False
+
+
+def _comp_factor_seed(damping):
+    # Frequency independent model (Seed et al., 1970)
+    # Correct dissipated energy
+    # Incorrect shear modulus: G * \sqrt{1 + 4 \beta^2 }
+    return 1 + 2j * damping
+
+
+def _comp_factor_kramer(damping):
+    # Simplifed shear modulus (Kramer, 1996)
+    # Correct dissipated energy
+    # Incorrect shear modulus: G * \sqrt{1 + 2 \beta^2 + \beta^4 }
+    return 1 - damping ** 2 + 2j * damping
+
+
+def _comp_factor_dormieux(damping):
+    # Dormieux and Canou (1990)
+    # Correct dissipated energy
+    # Correct shear modulus:
+    return np.sqrt(1 - 4 * damping ** 2) + 2j * damping
+
+
+# Complex modulus factor for each of the COMP_MODULUS_MODEL options
+_COMP_FACTORS = {
+    'seed': _comp_factor_seed,
+    'kramer': _comp_factor_kramer,
+    'dormieux': _comp_factor_dormieux,
+}
+
+
+def _get_comp_factor():
+    """Complex modulus factor function of the COMP_MODULUS_MODEL."""
+    try:
+        return _COMP_FACTORS[COMP_MODULUS_MODEL]
+    except KeyError:
+        raise NotImplementedError
+
+
+@numba.njit(cache=True)
+def _interp_linear(x, xp, fp, step_inv=0.):
+    """Linear interpolation on sorted points with constant extrapolation.
+
+    If `xp` is uniformly spaced, `step_inv` is the inverse of the spacing
+    and the interval is computed directly instead of being searched.
+    """
+    values = np.empty_like(x)
+    last = xp.size - 1
+    for i in range(x.size):
+        if np.isnan(x[i]):
+            values[i] = np.nan
+        elif x[i] <= xp[0]:
+            values[i] = fp[0]
+        elif x[i] >= xp[last]:
+            values[i] = fp[last]
+        else:
+            if step_inv > 0:
+                j = min(int((x[i] - xp[0]) * step_inv), last - 1)
+                # Correct for round-off in the computed interval
+                if x[i] < xp[j]:
+                    j -= 1
+                elif x[i] >= xp[j + 1]:
+                    j += 1
+            else:
+                j = np.searchsorted(xp, x[i], side='right') - 1
+            frac = (x[i] - xp[j]) / (xp[j + 1] - xp[j])
+            values[i] = fp[j] + frac * (fp[j + 1] - fp[j])
+    return values
+
+
+@numba.njit(cache=True)
+def _calc_modified_hyperbolic(strains, strain_ref, curvature, num_cycles):
+    """Shear-modulus reduction and damping of the modified hyperbolic model.
+
+    The damping [decimal] does not include the minimum damping.
+    """
+    # Correction between perfect hyperbolic strain model and modified
+    # model [%].
+    c1 = -1.1143 * curvature ** 2 + 1.8618 * curvature + 0.2523
+    c2 = 0.0805 * curvature ** 2 - 0.0710 * curvature - 0.0095
+    c3 = -0.0005 * curvature ** 2 + 0.0002 * curvature + 0.0003
+    # Masing correction factor, including the conversion to decimal
+    masing_corr = (0.6329 - 0.00566 * np.log(num_cycles)) / 100.
+
+    strain_ref_percent = strain_ref * 100
+    mod_reduc = np.empty_like(strains)
+    damping = np.empty_like(strains)
+    damping_max = -np.inf
+    for i in range(strains.size):
+        # Modified hyperbolic shear modulus reduction
+        mod_reduc[i] = 1 / (1 + (strains[i] / strain_ref) ** curvature)
+
+        # Masing damping based on shear -modulus reduction [%]
+        strain_percent = strains[i] * 100
+        damping_masing_a1 = (
+            (100. / np.pi) * (4 * (strain_percent - strain_ref_percent * np.log(
+                (strain_percent + strain_ref_percent) / strain_ref_percent)) /
+                              (strain_percent ** 2 / (strain_percent + strain_ref_percent)) - 2.))
+        # Cubic polynomial evaluated with Horner's method
+        damping_masing = damping_masing_a1 * (
+            c1 + damping_masing_a1 * (c2 + damping_masing_a1 * c3))
+        d_correction = damping_masing * masing_corr * mod_reduc[i] ** 0.1
+
+        # Prevent the damping from reducing as it can at large strains.
+        # NaN is propagated as with np.maximum.accumulate.
+        if d_correction > damping_max or np.isnan(d_correction):
+            damping_max = d_correction
+        damping[i] = damping_max
+
+    return mod_reduc, damping
+
 
 class NonlinearProperty(object):
     """Class for nonlinear property with a method for log-linear interpolation.
@@ -54,21 +171,27 @@ class NonlinearProperty(object):
 
             damping
                 Damping ratio curve [decimal]
+    ln_strains: :class:`numpy.ndarray`, optional
+        natural logarithm of `strains`. If provided, it is used instead of
+        being computed from `strains`.
     """
 
     PARAMS = ['mod_reduc', 'damping']
 
-    def __init__(self, name='', strains=None, values=None, param=None):
+    def __init__(self, name='', strains=None, values=None, param=None,
+                 ln_strains=None):
         self.name = name
-        self._strains = np.asarray(strains).astype(float)
-        self._values = np.asarray(values).astype(float)
+        self._strains = np.asarray(strains, dtype=float)
+        self._values = np.asarray(values, dtype=float)
 
-        self._interpolater = None
+        self._ln_strains = None
+        self._ln_step_inv = 0.
+        self._interp_values = None
 
         self._param = None
         self.param = param
 
-        self._update()
+        self._update(ln_strains)
 
     def __call__(self, strains):
         """Return the nonlinear property at a specific strain.
@@ -79,8 +202,8 @@ class NonlinearProperty(object):
         then the value corresponding to the smallest or largest value is
         returned.
 
-        The interpolation is performed using either a cubic-spline, if enough
-        points are provided, or using linear interpolation.
+        The interpolation is performed using linear interpolation of the
+        log-strains.
 
         Parameters
         ----------
@@ -92,14 +215,40 @@ class NonlinearProperty(object):
         float or array_like
             The nonlinear property at the requested strain(s).
         """
-        ln_strains = np.log(np.maximum(1E-9, strains))
+        return self.eval_log(np.log(np.maximum(1E-9, strains)))
+
+    def eval_log(self, ln_strains):
+        """Return the nonlinear property at a specific log-strain.
 
-        if self.strains.shape == self.values.shape:
+        Same as :meth:`__call__`, but for callers that have already computed
+        the natural logarithm of the strain.
+
+        Parameters
+        ----------
+        ln_strains: float or array_like
+            Natural logarithm of the shear strain of interest [decimal].
+
+        Returns
+        -------
+        float or array_like
+            The nonlinear property at the requested strain(s).
+        """
+        ln_strains = np.asarray(ln_strains, dtype=float)
+        if self._interp_values is None:
+            raise TypeError('Strains and values are not compatible')
+        elif self._interp_values.ndim == 1:
             # 1D interpolate
-            values = self._interpolater(ln_strains)
+            values = _interp_linear(
+                ln_strains.ravel(), self._ln_strains, self._interp_values,
+                self._ln_step_inv)
+            values = values.reshape(ln_strains.shape)
         else:
-            ln_strains = np.atleast_1d(ln_strains)
-            values = np.array([i(ln_strains[0]) for i in self._interpolater])
+            # Each column is interpolated at the first strain
+            ln_strain = ln_strains.flat[0]
+            values = np.array([
+                np.interp(ln_strain, self._ln_strains, v)
+                for v in self._interp_values.T
+            ])
         return values
 
     @property
@@ -109,7 +258,7 @@ class NonlinearProperty(object):
 
     @strains.setter
     def strains(self, strains):
-        self._strains = np.asarray(strains).astype(float)
+        self._strains = np.asarray(strains, dtype=float)
         self._update()
 
     @property
@@ -119,7 +268,7 @@ class NonlinearProperty(object):
 
     @values.setter
     def values(self, values):
-        self._values = np.asarray(values).astype(float)
+        self._values = np.asarray(values, dtype=float)
         self._update()
 
     @property
@@ -133,32 +282,41 @@ class NonlinearProperty(object):
             assert value in self.PARAMS
         self._param = value
 
-    def _update(self):
-        """Initialize the interpolation."""
+    def _update(self, ln_strains=None):
+        """Initialize the interpolation.
 
-        if not self.strains.size:
-            self._interpolater = None
-            return
+        Parameters
+        ----------
+        ln_strains: :class:`numpy.ndarray`, optional
+            natural logarithm of the strains, which is computed if not
+            provided.
+        """
+
+        self._ln_strains = None
+        self._ln_step_inv = 0.
+        self._interp_values = None
 
-        x = np.log(self.strains)
+        x = self.strains
         y = self.values
 
-        if self.strains.shape == self.values.shape:
-            # 1D interpolate
-            self._interpolater = interp1d(
-                x, y, 'linear',
-                bounds_error=False, fill_value=(y[0], y[-1])
-            )
-        elif (self.values.ndim == 2 and
-              self.strains.shape[0] == self.values.shape[0]):
-            self._interpolater = [
-                interp1d(
-                    x, y[:, i], 'linear',
-                    bounds_error=False, fill_value=(y[0, i], y[-1, i])
-                ) for i in range(y.shape[1])
-            ]
-        else:
-            self._interpolater = None
+        if not (x.size and x.ndim == 1 and y.ndim in (1, 2) and
+                y.shape[0] == x.size):
+            return
+
+        # Evaluation requires increasing strains
+        x = np.log(x) if ln_strains is None else np.asarray(ln_strains)
+        if np.any(np.diff(x) < 0):
+            order = np.argsort(x)
+            x = x[order]
+            y = y[order]
+        self._ln_strains = x
+        self._interp_values = y
+
+        # Strains are commonly log-spaced, which permits the interval to be
+        # computed without a search
+        steps = np.diff(x)
+        if steps.size and steps[0] > 0 and np.ptp(steps) <= 1E-6 * steps[0]:
+            self._ln_step_inv = 1 / steps[0]
 
 
 class SoilType(object):
@@ -249,38 +407,18 @@ class ModifiedHyperbolicSoilType(SoilType):
         super().__init__(name, unit_wt)
         self._num_cycles = num_cycles
 
+        # Log-strains are shared by both of the nonlinear curves
         if strains is None:
-            strains = np.logspace(-6, -1.5, num=20)  # in decimal
+            strains = _DEFAULT_STRAINS
+            ln_strains = _DEFAULT_LN_STRAINS
         else:
-            strains = np.asarray(strains)
+            strains = np.asarray(strains, dtype=float)
+            ln_strains = np.log(strains)
 
-        # Modified hyperbolic shear modulus reduction
-        mod_reduc = 1 / (1 + (strains / strain_ref) ** curvature)
+        mod_reduc, damping = _calc_modified_hyperbolic(
+            strains, strain_ref, curvature, num_cycles)
         self.mod_reduc = NonlinearProperty(name, strains, mod_reduc,
-                                           'mod_reduc')
-
-        # Masing damping based on shear -modulus reduction [%]
-        strains_percent = strains * 100
-        strain_ref_percent = strain_ref * 100
-        damping_masing_a1 = (
-            (100. / np.pi) * (4 * (strains_percent - strain_ref_percent * np.log(
-                (strains_percent + strain_ref_percent) / strain_ref_percent)) /
-                              (strains_percent ** 2 / (strains_percent + strain_ref_percent)) - 2.))
-        # Correction between perfect hyperbolic strain model and modified
-        # model [%].
-        c1 = -1.1143 * curvature ** 2 + 1.8618 * curvature + 0.2523
-        c2 = 0.0805 * curvature ** 2 - 0.0710 * curvature - 0.0095
-        c3 = -0.0005 * curvature ** 2 + 0.0002 * curvature + 0.0003
-        damping_masing = (c1 * damping_masing_a1 + c2 * damping_masing_a1 ** 2
-                          + c3 * damping_masing_a1 ** 3)
-
-        # Masing correction factor
-        masing_corr = 0.6329 - 0.00566 * np.log(num_cycles)
-        # Compute the damping correction in percent
-        d_correction = damping_masing * masing_corr * mod_reduc ** 0.1
-
-        # Prevent the damping from reducing as it can at large strains
-        damping = np.maximum.accumulate(d_correction / 100.)
+                                           'mod_reduc', ln_strains)
 
         # Add the minimum damping component
         if isinstance(damping_min, np.ndarray):
@@ -290,7 +428,8 @@ class ModifiedHyperbolicSoilType(SoilType):
             damping += damping_min
 
         # Convert to decimal values
-        self.damping = NonlinearProperty(name, strains, damping, 'damping')
+        self.damping = NonlinearProperty(name, strains, damping, 'damping',
+                                         ln_strains)
 
 
 class DarendeliSoilType(ModifiedHyperbolicSoilType):
@@ -373,7 +512,7 @@ class MenqSoilType(ModifiedHyperbolicSoilType):
         mean effective stress [kN/m²]
     num_cycles: float, default=10
         number of cycles of loading
-    strains: `array_like`, default: np.logspace(-4, 0.5, num=20)
+    strains: `array_like`, default: np.logspace(-6, -1.5, num=20)
         shear strains levels [decimal]
     """
 
@@ -444,7 +583,7 @@ class KishidaSoilType(SoilType):
         completeness, but the default value of 1 should be used for field
         applications.
     strains: `array_like` or None
-        shear strains levels. If *None*, a default of `np.logspace(-6, 0.5,
+        shear strains levels. If *None*, a default of `np.logspace(-6, -1.5,
         num=20)` will be used. The first strain should be small such that the
         shear modulus reduction is equal to 1. [decimal]
     """
@@ -462,10 +601,13 @@ class KishidaSoilType(SoilType):
         self._organic_content = float(organic_content)
         self._lab_consol_ratio = float(lab_consol_ratio)
 
+        # Log-strains are shared by both of the nonlinear curves
         if strains is None:
-            strains = np.logspace(-6, -1.5, num=20)
+            strains = _DEFAULT_STRAINS
+            ln_strains = _DEFAULT_LN_STRAINS
         else:
-            strains = np.asarray(strains)
+            strains = np.asarray(strains, dtype=float)
+            ln_strains = np.log(strains)
 
         strains_percent = strains * 100
 
@@ -486,19 +628,15 @@ class KishidaSoilType(SoilType):
         else:
             self._unit_wt = float(unit_wt)
 
-        # Convert to 1D arrays for matrix math support
-        ones = np.ones_like(strains)
-        x_2 = x_2 * ones
-        x_3 = x_3 * ones
-
         mod_reducs = self._calc_mod_reduc(strains_percent, strain_ref_percent, x_1, x_1_mean,
                                           x_2, x_2_mean, x_3, x_3_mean)
         dampings = self._calc_damping(mod_reducs, x_2, x_2_mean, x_3, x_3_mean)
 
         name = self._create_name()
         self.mod_reduc = NonlinearProperty(name, strains, mod_reducs,
-                                           'mod_reduc')
-        self.damping = NonlinearProperty(name, strains, dampings, 'damping')
+                                           'mod_reduc', ln_strains)
+        self.damping = NonlinearProperty(name, strains, dampings, 'damping',
+                                         ln_strains)
 
     @staticmethod
     def _calc_strain_ref(x_3, x_3_mean):
@@ -511,20 +649,32 @@ class KishidaSoilType(SoilType):
                         x_2_mean, x_3, x_3_mean):
         """Compute the shear modulus reduction using Equation (1)."""
 
-        ones = np.ones_like(strains)
-        # Predictor
-        x_4 = np.log(self._lab_consol_ratio) * ones
-        x = np.c_[ones, x_1, x_2, x_3, x_4, (x_1 - x_1_mean) * (
-            x_2 - x_2_mean), (x_1 - x_1_mean) * (x_3 - x_3_mean), (
-                x_2 - x_2_mean) * (x_3 - x_3_mean), (x_1 - x_1_mean) * (
-                    x_2 - x_2_mean) * (x_3 - x_3_mean)]
+        # Predictors assigned to the columns of a preallocated matrix
+        x = np.empty((strains.size, 9))
+        x[:, 0] = 1.
+        x[:, 1] = x_1
+        x[:, 2] = x_2
+        x[:, 3] = x_3
+        x[:, 4] = np.log(self._lab_consol_ratio)
+        x[:, 5] = (x_1 - x_1_mean) * (x_2 - x_2_mean)
+        x[:, 6] = (x_1 - x_1_mean) * (x_3 - x_3_mean)
+        x[:, 7] = (x_2 - x_2_mean) * (x_3 - x_3_mean)
+        x[:, 8] = x[:, 5] * (x_3 - x_3_mean)
         # Coefficients
         denom = np.log(1 / strain_ref + strains / strain_ref)  # TODO: is this percent or decimal?
-        b = np.c_[5.11 * ones, -0.729 * ones, (1 - 0.37 * x_3_mean * (1 + ((
-            np.log(strain_ref) - x_1_mean) / denom))), -0.693 * ones, 0.8 - 0.4
-                  * x_3, 0.37 * x_3_mean / denom, 0.0 * ones, -0.37 * (1 + (
-                      np.log(strain_ref) - x_1_mean) / denom), 0.37 / denom, ]
-        ln_shear_mod = (b * x).sum(axis=1)
+        b = np.empty_like(x)
+        b[:, 0] = 5.11
+        b[:, 1] = -0.729
+        b[:, 2] = 1 - 0.37 * x_3_mean * (1 + ((
+            np.log(strain_ref) - x_1_mean) / denom))
+        b[:, 3] = -0.693
+        b[:, 4] = 0.8 - 0.4 * x_3
+        b[:, 5] = 0.37 * x_3_mean / denom
+        b[:, 6] = 0.
+        b[:, 7] = -0.37 * (1 + (np.log(strain_ref) - x_1_mean) / denom)
+        b[:, 8] = 0.37 / denom
+        # Row-wise dot product without the intermediate (b * x) array
+        ln_shear_mod = np.einsum('ij,ij->i', b, x)
         shear_mod = np.exp(ln_shear_mod)
         mod_reduc = shear_mod / shear_mod[0]
         return mod_reduc
@@ -536,20 +686,21 @@ class KishidaSoilType(SoilType):
         x_1_mean = -1.0
         x_1 = np.log(np.log(1 / mod_reducs) + 0.103)
 
-        ones = np.ones_like(mod_reducs)
-        x = np.c_[ones, x_1, x_2, x_3, (x_1 - x_1_mean) * (x_2 - x_2_mean), (
-            x_2 - x_2_mean) * (x_3 - x_3_mean)]
-        c = np.c_[2.86, 0.571, -0.103, -0.141, 0.0419, -0.240]
+        x = np.empty((mod_reducs.size, 6))
+        x[:, 0] = 1.
+        x[:, 1] = x_1
+        x[:, 2] = x_2
+        x[:, 3] = x_3
+        x[:, 4] = (x_1 - x_1_mean) * (x_2 - x_2_mean)
+        x[:, 5] = (x_2 - x_2_mean) * (x_3 - x_3_mean)
+        c = np.array([2.86, 0.571, -0.103, -0.141, 0.0419, -0.240])
 
-        ln_damping = (c * x).sum(axis=1)
+        ln_damping = x @ c
         return np.exp(ln_damping) / 100.
 
     @staticmethod
     def _calc_unit_wt(x_1, x_2):
-        x = np.r_[1, x_1, x_2]
-        d = np.r_[-0.112, 0.038, 0.360]
-
-        ln_density = d.T @ x
+        ln_density = -0.112 + 0.038 * x_1 + 0.360 * x_2
         unit_wt = np.exp(ln_density) * scipy.constants.g
         return unit_wt
 
@@ -564,6 +715,8 @@ class IterativeValue(object):
     def __init__(self, value):
         self._value = value
         self._previous = None
+        # Reused between evaluations of the relative error
+        self._err_buf = None
 
     @property
     def value(self):
@@ -580,21 +733,34 @@ class IterativeValue(object):
 
     @property
     def relative_error(self):
-        """The relative error, in percent, between the two iterations.
+        """The maximum absolute relative error, in percent, between the two
+        iterations.
+
+        A change from a value of zero has an infinite relative error.
         """
-        if self.previous is not None:
-            # FIXME
-            # Use the maximum strain value -- this is important for error
-            #  calculation with frequency dependent properties
-            # prev = np.max(self.previous)
-            # value = np.max(self.value)
-            try:
-                err = 100. * np.max((self.previous - self.value) / self.value)
-            except ZeroDivisionError:
-                err = np.inf
-        else:
-            err = 0
-        return err
+        if self.previous is None:
+            return 0
+
+        # FIXME
+        # Use the maximum strain value -- this is important for error
+        #  calculation with frequency dependent properties
+        # prev = np.max(self.previous)
+        # value = np.max(self.value)
+        value = np.asarray(self.value, dtype=float)
+        shape = np.broadcast(self.previous, value).shape
+        if self._err_buf is None or self._err_buf.shape != shape:
+            self._err_buf = np.empty(shape)
+        err = self._err_buf
+
+        np.subtract(self.previous, value, out=err)
+        nonzero = value != 0
+        np.divide(err, value, out=err, where=nonzero)
+        np.abs(err, out=err)
+        if not np.all(nonzero):
+            # Only the differences remain where the value is zero
+            err[np.broadcast_to(~nonzero, shape) & (err > 0)] = np.inf
+
+        return 100. * float(np.max(err))
 
     def reset(self):
         self._previous = None
@@ -606,11 +772,15 @@ class Layer(object):
     def __init__(self, soil_type, thickness, shear_vel):
         """@todo: to be defined! """
         self._profile = None
+        # Position within the profile, which is set by the profile
+        self._index = None
 
         self._soil_type = soil_type
         self._thickness = thickness
         self._initial_shear_vel = shear_vel
 
+        self._density = None
+        self._initial_shear_mod = None
         self._damping = None
         self._shear_mod = None
         self._strain = None
@@ -653,7 +823,7 @@ class Layer(object):
     @property
     def density(self):
         """Density of soil in [kg/m³]."""
-        return self.soil_type.density
+        return self._density
 
     @property
     def damping(self):
@@ -667,7 +837,7 @@ class Layer(object):
     @property
     def initial_shear_mod(self):
         """Initial (small-strain) shear modulus [kN/m²]."""
-        return self.density * self.initial_shear_vel ** 2
+        return self._initial_shear_mod
 
     @property
     def initial_shear_vel(self):
@@ -678,25 +848,8 @@ class Layer(object):
     def comp_shear_mod(self):
         """Strain-compatible complex shear modulus [kN/m²].
         """
-        damping = self.damping
-        if COMP_MODULUS_MODEL == 'seed':
-            # Frequency independent model (Seed et al., 1970)
-            # Correct dissipated energy
-            # Incorrect shear modulus: G * \sqrt{1 + 4 \beta^2 }
-            comp_factor = 1 + 2j * damping
-        elif COMP_MODULUS_MODEL == 'kramer':
-            # Simplifed shear modulus (Kramer, 1996)
-            # Correct dissipated energy
-            # Incorrect shear modulus: G * \sqrt{1 + 2 \beta^2 + \beta^4 }
-            comp_factor = 1 - damping ** 2 + 2j * damping
-        elif COMP_MODULUS_MODEL == 'dormieux':
-            # Dormieux and Canou (1990)
-            # Correct dissipated energy
-            # Correct shear modulus:
-            comp_factor = np.sqrt(1 - 4 * damping ** 2) + 2j * damping
-        else:
-            raise NotImplementedError
-        comp_shear_mod = self.shear_mod * comp_factor
+        calc_comp_factor = _get_comp_factor()
+        comp_shear_mod = self.shear_mod * calc_comp_factor(self.damping)
         return comp_shear_mod
 
     @property
@@ -710,9 +863,25 @@ class Layer(object):
                    self._damping.relative_error)
 
     def reset(self):
+        # Small-strain properties are fixed until the next reset
+        self._density = self.soil_type.density
+        self._initial_shear_mod = self._density * self._initial_shear_vel ** 2
+
         self._shear_mod = IterativeValue(self.initial_shear_mod)
         self._damping = IterativeValue(self.soil_type.damping_min)
         self._strain = IterativeValue(None)
+        self._invalidate_profile()
+
+    def _invalidate_profile(self, strain_only=False):
+        """Flag the cached property arrays of the profile as out of date.
+
+        If `strain_only`, only the strain-compatible arrays are flagged.
+        """
+        if self._profile is not None:
+            if strain_only:
+                self._profile._strain_arrays_dirty = True
+            else:
+                self._profile._arrays_dirty = True
 
     @property
     def shear_mod(self):
@@ -758,19 +927,33 @@ class Layer(object):
         else:
             self._strain = strain
 
-        # Update the shear modulus and damping
+        self._invalidate_profile(strain_only=True)
+
+        # Update the shear modulus and damping. The log-strain is shared by
+        # both nonlinear curves.
+        if self.soil_type.is_nonlinear:
+            ln_strain = np.log(np.maximum(1E-9, strain))
+
+        mod_reduc = self.soil_type.mod_reduc
         try:
-            mod_reduc = self.soil_type.mod_reduc(strain)
+            if isinstance(mod_reduc, NonlinearProperty):
+                mod_reduc = mod_reduc.eval_log(ln_strain)
+            else:
+                mod_reduc = mod_reduc(strain)
         except TypeError:
             mod_reduc = 1.
 
         self._shear_mod.value = self.initial_shear_mod * mod_reduc
 
+        damping = self.soil_type.damping
         try:
-            self._damping.value = self.soil_type.damping(strain)
+            if isinstance(damping, NonlinearProperty):
+                self._damping.value = damping.eval_log(ln_strain)
+            else:
+                self._damping.value = damping(strain)
         except TypeError:
             # No iteration provided by damping
-            self._damping.value = self.soil_type.damping
+            self._damping.value = damping
 
     @property
     def soil_type(self):
@@ -783,7 +966,8 @@ class Layer(object):
     @thickness.setter
     def thickness(self, thickness):
         self._thickness = thickness
-        self._profile.update_layers(self, self._profile.index(self) + 1)
+        if self._profile is not None:
+            self._profile.update_layers(self._index + 1)
 
     @property
     def travel_time(self):
@@ -804,9 +988,14 @@ class Layer(object):
             stress_vert -= pore_pressure
         return stress_vert
 
+    @property
+    def damping_min(self):
+        """Small-strain damping [decimal]."""
+        return self.soil_type.damping_min
+
     @property
     def incr_site_atten(self):
-        return ((2 * self.soil_type.damping_min * self._thickness) /
+        return ((2 * self.damping_min * self._thickness) /
                 self.initial_shear_vel)
 
 
@@ -849,10 +1038,20 @@ class Location(object):
 class Profile(collections.abc.Container):
     """Soil profile with an infinite halfspace at the base."""
 
+    # Layer attributes that do not change with the strain
+    _SMALL_STRAIN_ATTRS = frozenset([
+        'thickness', 'depth', 'depth_mid', 'initial_shear_vel',
+        'damping_min', 'density'
+    ])
+
     def __init__(self, layers=None, wt_depth=0):
         super().__init__()
         self.layers = layers or []
         self.wt_depth = wt_depth
+        self._cached_values = {}
+        self._cached_strain_values = {}
+        self._arrays_dirty = False
+        self._strain_arrays_dirty = False
         if layers:
             self.update_layers()
 
@@ -869,6 +1068,10 @@ class Profile(collections.abc.Container):
         return self.layers[key]
 
     def index(self, layer):
+        # Use the position stored by update_layers if it is still valid
+        i = layer._index
+        if i is not None and 0 <= i < len(self) and self.layers[i] is layer:
+            return i
         return self.layers.index(layer)
 
     def append(self, layer):
@@ -881,6 +1084,9 @@ class Profile(collections.abc.Container):
         self.update_layers(index)
 
     def update_layers(self, start_layer=0):
+        # Layer properties need to be recomputed
+        self._arrays_dirty = True
+
         if start_layer < 1:
             depth = 0
             stress_vert = 0
@@ -890,16 +1096,21 @@ class Profile(collections.abc.Container):
             stress_vert = ref_layer.stress_vert(
                 ref_layer.thickness, effective=False)
 
-        for layer in self[start_layer:]:
+        layers = self[start_layer:]
+        # The values at the base of each layer are applied at the top of the
+        # next layer. The thickness of the final layer is not used.
+        thicks = np.array([l.thickness for l in layers[:-1]], dtype=float)
+        unit_wts = np.array([l.unit_wt for l in layers[:-1]], dtype=float)
+        depths = depth + np.r_[0, np.cumsum(thicks)]
+        stress_verts = stress_vert + np.r_[0, np.cumsum(thicks * unit_wts)]
+
+        for i, (layer, depth, stress_vert) in enumerate(
+                zip(layers, depths.tolist(), stress_verts.tolist()),
+                start_layer):
             layer._profile = self
+            layer._index = i
             layer._depth = depth
             layer._stress_vert = stress_vert
-            if layer != self[-1]:
-                # Use the layer to compute the values at the base of the
-                # layer, and apply them at the top of the next layer
-                depth = layer.depth_base
-                stress_vert = layer.stress_vert(
-                    layer.thickness, effective=False)
 
     def iter_soil_types(self):
         yielded = set()
@@ -952,7 +1163,17 @@ class Profile(collections.abc.Container):
         return GRAVITY * max(depth - self.wt_depth, 0)
 
     def site_attenuation(self):
-        return sum(l.incr_site_atten for l in self)
+        # The minimum damping may be frequency dependent, so all properties
+        # are arranged with a row per layer before being broadcast together
+        shape = (len(self), -1)
+        incr_site_atten = (
+            2 * self._get_cached_values('damping_min').reshape(shape) *
+            self._get_cached_values('thickness').reshape(shape) /
+            self._get_cached_values('initial_shear_vel').reshape(shape))
+        site_atten = np.sum(incr_site_atten, axis=0)
+        if site_atten.size == 1:
+            site_atten = site_atten[0]
+        return site_atten
 
     def location(self, wave_field, depth=None, index=None):
         """Create a Location for a specific depth.
@@ -978,10 +1199,12 @@ class Profile(collections.abc.Container):
             wave_field = WaveField[wave_field]
 
         if index is None and depth is not None:
-            for i, layer in enumerate(self[:-1]):
-                if layer.depth <= depth < layer.depth_base:
-                    depth_within = depth - layer.depth
-                    break
+            # The top of each layer is the base of the layer above it
+            depths = self._get_cached_values('depth')
+            i = int(np.searchsorted(depths[1:], depth, side='right'))
+            layer = self[i]
+            if i < len(self) - 1 and layer.depth <= depth:
+                depth_within = depth - layer.depth
             else:
                 # Bedrock
                 i = len(self) - 1
@@ -1009,13 +1232,16 @@ class Profile(collections.abc.Container):
         avg_vel: float
             Time averaged velocity.
         """
-        depths = [l.depth for l in self]
+        depths = self._get_cached_values('depth')
+        shear_vels = self._get_cached_values('shear_vel')
         # Final layer is infinite and is treated separately
-        travel_times = [0] + [l.travel_time for l in self[:-1]]
+        travel_times = np.r_[
+            0, self._get_cached_values('thickness')[:-1] / shear_vels[:-1]]
         # If needed, add the final layer to the required depth
         if depths[-1] < depth:
-            depths.append(depth)
-            travel_times.append((depth - self[-1].depth) / self[-1].shear_vel)
+            travel_times = np.r_[
+                travel_times, (depth - depths[-1]) / shear_vels[-1]]
+            depths = np.r_[depths, depth]
 
         total_travel_times = np.cumsum(travel_times)
         # Interpolate the travel time to the depth of interest
@@ -1033,27 +1259,81 @@ class Profile(collections.abc.Container):
             Equivalent shear-wave velocity.
         """
         # FIXME: What if last layer has no thickness?
-        thicks = np.array([l.thickness for l in self])
-        depths_mid = np.array([l.depth_mid for l in self])
-        shear_vels = np.array([l.shear_vel for l in self])
+        thicks = self._get_cached_values('thickness')
+        depths_mid = self._get_cached_values('depth_mid')
+        shear_vels = self._get_cached_values('shear_vel')
 
         mode_incr = depths_mid * thicks / shear_vels ** 2
         # Mode shape is computed as the sumation from the base of
-        # the profile. Need to append a 0 for the roll performed in the next
-        # step
+        # the profile. Need to append a 0 for the offset performed in the
+        # next step
         shape = np.r_[np.cumsum(mode_incr[::-1])[::-1], 0]
 
         freq_fund = np.sqrt(4 * np.sum(
             thicks * depths_mid ** 2 / shear_vels ** 2
         ) / np.sum(
             thicks *
-            # Roll is used to offset the mode_shape so that the sum
-            # can be calculated for two adjacent layers
-            np.sum(np.c_[shape, np.roll(shape, -1)], axis=1)[:-1] ** 2))
+            # Offset the mode shape so that the sum can be calculated for
+            # two adjacent layers
+            (shape[:-1] + shape[1:]) ** 2))
         period_fun = 2 * np.pi / freq_fund
         rayleigh_vel = 4 * thicks.sum() / period_fun
         return rayleigh_vel
 
+    def comp_shear_mods(self, out=None):
+        """Strain-compatible complex shear modulus of all layers [kN/m²].
+
+        Parameters
+        ----------
+        out: :class:`numpy.ndarray`, optional
+            complex array used to store the values. It must have the shape
+            of the result, which is `(n_layers, 1)` if no property is
+            frequency dependent.
+
+        Returns
+        -------
+        comp_shear_mods: :class:`numpy.ndarray`
+            complex shear modulus with a row for each layer, and a column for
+            each frequency if the properties are frequency dependent.
+        """
+        calc_comp_factor = _get_comp_factor()
+
+        # Either property may be frequency dependent, so both are arranged
+        # with a row per layer before being broadcast together
+        shape = (len(self), -1)
+        shear_mods = self._get_cached_values('shear_mod').reshape(shape)
+        dampings = self._get_cached_values('damping').reshape(shape)
+        return np.multiply(shear_mods, calc_comp_factor(dampings), out=out)
+
+    def comp_shear_vels(self, comp_shear_mods=None, out=None):
+        """Strain-compatible complex shear-wave velocity of all layers [m/s].
+
+        Parameters
+        ----------
+        comp_shear_mods: :class:`numpy.ndarray`, optional
+            complex shear modulus from :meth:`comp_shear_mods`. If not
+            provided, it is computed.
+        out: :class:`numpy.ndarray`, optional
+            complex array used to store the values. It must have the shape
+            of the result, which is `(n_layers, 1)` if no property is
+            frequency dependent.
+
+        Returns
+        -------
+        comp_shear_vels: :class:`numpy.ndarray`
+            complex shear-wave velocity with the same shape as
+            :meth:`comp_shear_mods`.
+        """
+        if comp_shear_mods is None:
+            comp_shear_mods = self.comp_shear_mods(out)
+            out = comp_shear_mods
+        # Broadcast over frequency-dependent values
+        comp_shear_vels = np.divide(
+            comp_shear_mods,
+            self._get_cached_values('density')[:, np.newaxis],
+            out=out)
+        return np.sqrt(comp_shear_vels, out=comp_shear_vels)
+
     @property
     def density(self):
         return self._get_values('density')
@@ -1076,3 +1356,35 @@ class Profile(collections.abc.Container):
 
     def _get_values(self, attr):
         return np.array([getattr(l, attr) for l in self])
+
+    def _get_cached_values(self, attr):
+        """Values of a layer attribute as a float array that is cached until
+        the layers are updated, or for strain-compatible attributes until
+        the strains are updated. The returned array is read-only."""
+        if self._arrays_dirty:
+            self._cached_values = {}
+            self._cached_strain_values = {}
+            self._arrays_dirty = False
+            self._strain_arrays_dirty = False
+        elif self._strain_arrays_dirty:
+            self._cached_strain_values = {}
+            self._strain_arrays_dirty = False
+
+        if attr in self._SMALL_STRAIN_ATTRS:
+            cached_values = self._cached_values
+        else:
+            cached_values = self._cached_strain_values
+
+        try:
+            values = cached_values[attr]
+        except KeyError:
+            values = [getattr(l, attr) for l in self]
+            try:
+                values = np.array(values, dtype=float)
+            except ValueError:
+                # Frequency-dependent properties are provided as arrays for
+                # some of the layers
+                values = np.array(np.broadcast_arrays(*values), dtype=float)
+            values.flags.writeable = False
+            cached_values[attr] = values
+        return values
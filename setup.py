@@ -20,6 +20,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         'matplotlib',
+        'numba',
         'numpy',
         'pyrvt',
         'scipy',
@@ -47,6 +47,22 @@ def test_nlp(nlp, strain, expected):
     assert_allclose(nlp(strain), expected)
 
 
+@pytest.mark.parametrize('strains', [
+    np.logspace(-6, -1.5, num=20),
+    [1E-6, 3E-5, 1E-4, 2E-3, 3E-2],
+])
+def test_nlp_log_interp(strains):
+    """Test NonlinearProperty interpolation on uniform and non-uniform
+    log-strain spacing."""
+    values = np.linspace(1, 0.1, len(strains))
+    nlp = site.NonlinearProperty('', strains, values)
+
+    queries = np.logspace(-7, 0, 50)
+    expected = np.interp(np.log(queries), np.log(strains), values)
+    assert_allclose(nlp(queries), expected)
+    assert_allclose(nlp(strains), values)
+
+
 @pytest.mark.parametrize('strains', [0.1, [0.1, 10]])
 def test_nlp_update(nlp, strains):
     """Test if strains are saved."""
@@ -54,6 +70,20 @@ def test_nlp_update(nlp, strains):
     assert_allclose(nlp.strains, strains)
 
 
+def test_nlp_values_update(nlp):
+    """Test if updated values are used after a repeated evaluation."""
+    assert_allclose(nlp(0.1), 0.5)
+    nlp.values = [0., 2.]
+    assert_allclose(nlp(0.1), 1.0)
+
+
+def test_nlp_values_writeable(nlp):
+    """Test that the interpolated values can be modified by the caller."""
+    values = nlp([0.1, 1.])
+    values *= 2
+    assert_allclose(values, [1., 2.])
+
+
 @pytest.fixture
 def soil_type_darendeli():
     """Create an example DarendeliSoilType."""
@@ -88,6 +118,19 @@ def test_iterative_value():
     assert_allclose(iv.relative_error, 10.)
 
 
+@pytest.mark.parametrize('previous,value,expected', [
+    (9, 10, 10.),
+    ([11, 9], [10, 10], 10.),
+    ([0, 1], [0, 1], 0.),
+    (1, 0, np.inf),
+])
+def test_iterative_value_error(previous, value, expected):
+    """Test the relative error is the maximum absolute change."""
+    iv = site.IterativeValue(previous)
+    iv.value = value
+    assert_allclose(iv.relative_error, expected)
+
+
 def test_soil_type_linear():
     """Test the soil type update process on a linear material."""
     damping = 1.0
@@ -114,6 +157,19 @@ def test_soil_type_iterative():
     assert_allclose(layer.damping, 0.05)
 
 
+@pytest.mark.parametrize('model,expected', [
+    ('seed', 1 + 0.2j),
+    ('kramer', 0.99 + 0.2j),
+    ('dormieux', np.sqrt(0.96) + 0.2j),
+])
+def test_comp_shear_mod(monkeypatch, model, expected):
+    """Test the complex shear modulus models."""
+    monkeypatch.setattr(site, 'COMP_MODULUS_MODEL', model)
+    layer = site.Layer(site.SoilType('', 18.0, None, 0.1), 2., 500.)
+    layer.strain = 0.1
+    assert_allclose(layer.comp_shear_mod, expected * layer.initial_shear_mod)
+
+
 with (FPATH_DATA / 'kishida_2009.json').open() as fp:
     kishida_cases = json.load(fp)
     for i in range(len(kishida_cases)):
@@ -191,6 +247,41 @@ def test_time_average_vel(depth, expected):
     )
 
 
+def test_time_average_vel_strain():
+    """Test time averaged shear-wave velocity after a strain update."""
+    mod_reduc = site.NonlinearProperty('', [0.0001, 0.01], [1, 0])
+    st = site.SoilType('', 17., mod_reduc, 0.05)
+    p = site.Profile([
+        site.Layer(st, 10, 300),
+        site.Layer(site.SoilType(unit_wt=17), None, 600),
+    ])
+    assert_allclose(p.time_average_vel(10), 300)
+
+    # Strain corresponding to 25% of the initial shear modulus
+    p[0].strain = 10 ** -0.5 * 0.01
+    assert_allclose(p.time_average_vel(10), 150)
+
+
+def test_cached_values_strain():
+    """Test only strain-compatible arrays are rebuilt after a strain update."""
+    mod_reduc = site.NonlinearProperty('', [0.0001, 0.01], [1, 0])
+    st = site.SoilType('', 17., mod_reduc, 0.05)
+    p = site.Profile([
+        site.Layer(st, 10, 300),
+        site.Layer(site.SoilType(unit_wt=17), None, 600),
+    ])
+    thicknesses = p._get_cached_values('thickness')
+    shear_vels = p._get_cached_values('shear_vel')
+
+    p[0].strain = 10 ** -0.5 * 0.01
+    assert p._get_cached_values('thickness') is thicknesses
+    assert_allclose(p._get_cached_values('shear_vel'), [150, 600])
+
+    p[0].thickness = 20
+    assert_allclose(p._get_cached_values('thickness'), [20, np.nan])
+    assert shear_vels is not p._get_cached_values('shear_vel')
+
+
 def test_simplified_rayleigh_vel():
     """Test simplified Rayleigh wave velocity."""
     # Example from Urzua et al. (2017). Table 1 in Appendix A
@@ -216,3 +307,136 @@ def test_simplified_rayleigh_vel():
         1349.076,
         atol=0.001,
     )
+
+
+def test_site_attenuation():
+    """Test site attenuation is updated with the layer thickness."""
+    st = site.SoilType(unit_wt=17, damping=0.02)
+    p = site.Profile([
+        site.Layer(st, 10, 300),
+        site.Layer(st, 20, 600),
+        site.Layer(st, 0, 900),
+    ])
+    assert_allclose(p.site_attenuation(), 2 * 0.02 * (10 / 300 + 20 / 600))
+
+    p[1].thickness = 40
+    assert_allclose(p.site_attenuation(), 2 * 0.02 * (10 / 300 + 40 / 600))
+    assert_allclose(p[2].depth, 50)
+
+
+@pytest.mark.parametrize('count', [2, 3])
+def test_site_attenuation_freq_dependent(count):
+    """Test site attenuation with a frequency-dependent minimum damping."""
+    st = site.ModifiedHyperbolicSoilType(
+        '', 18, 0.0005, 0.9, np.array([0.01, 0.02, 0.03]))
+    rock = site.SoilType(unit_wt=22, damping=0.01)
+    p = site.Profile(
+        [site.Layer(st, 10, 300) for _ in range(count)] +
+        [site.Layer(rock, 0, 900)])
+    site_atten = p.site_attenuation()
+    assert site_atten.shape == (3, )
+    assert_allclose(site_atten, sum(layer.incr_site_atten for layer in p))
+    assert_allclose(site_atten, 2 * st.damping_min * count * 10 / 300)
+
+
+def test_profile_insert():
+    """Test layer indices and depths after inserting a layer."""
+    st = site.SoilType(unit_wt=17)
+    p = site.Profile([
+        site.Layer(st, 10, 300),
+        site.Layer(st, 0, 900),
+    ])
+    new_layer = site.Layer(st, 5, 600)
+    p.insert(1, new_layer)
+    assert [p.index(layer) for layer in p] == [0, 1, 2]
+    assert_allclose([layer.depth for layer in p], [0, 10, 15])
+
+    new_layer.thickness = 20
+    assert_allclose([layer.depth for layer in p], [0, 10, 30])
+
+
+@pytest.mark.parametrize('depth,index,depth_within', [
+    (0, 0, 0),
+    (5, 0, 5),
+    (10, 2, 0),
+    (12, 2, 2),
+    (15, 3, 0),
+    (20, 3, 0),
+])
+def test_location_depth(depth, index, depth_within):
+    """Test the layer found for a location by depth."""
+    st = site.SoilType(unit_wt=17)
+    p = site.Profile([
+        site.Layer(st, 10, 300),
+        site.Layer(st, 0, 400),
+        site.Layer(st, 5, 500),
+        site.Layer(st, None, 900),
+    ])
+    loc = p.location('within', depth=depth)
+    assert loc.index == index
+    assert loc.layer is p[index]
+    assert_allclose(loc.depth_within, depth_within)
+
+
+@pytest.mark.parametrize('nonlinear', [
+    ('mod_reduc', 'damping'),
+    ('mod_reduc', ),
+    ('damping', ),
+])
+def test_comp_shear_props(nonlinear):
+    """Test complex properties of the profile match those of the layers."""
+    props = {
+        'mod_reduc': site.NonlinearProperty('', [0.0001, 0.01], [1, 0]),
+        'damping': site.NonlinearProperty('', [0.0001, 0.01], [0, 0.10]),
+    }
+    if 'mod_reduc' not in nonlinear:
+        props['mod_reduc'] = None
+    if 'damping' not in nonlinear:
+        props['damping'] = 0.05
+    st = site.SoilType('', 18.0, **props)
+    p = site.Profile([
+        site.Layer(st, 10, 300),
+        site.Layer(st, 10, 400),
+        site.Layer(site.SoilType('', 20.0, None, 0.02), 0, 900),
+    ])
+    # Frequency dependent strains, with a different number of frequencies
+    # than layers
+    p[0].strain = [0.0005, 0.001, 0.002, 0.003, 0.004]
+    p[1].strain = [0.0002, 0.0004, 0.0008, 0.001, 0.002]
+
+    comp_shear_mods = p.comp_shear_mods()
+    comp_shear_vels = p.comp_shear_vels()
+    assert comp_shear_mods.shape == (3, 5)
+    for i, l in enumerate(p):
+        assert_allclose(comp_shear_mods[i], l.comp_shear_mod)
+        assert_allclose(comp_shear_vels[i], l.comp_shear_vel)
+
+    out = np.empty((3, 5), dtype=complex)
+    assert p.comp_shear_vels(out=out) is out
+    assert_allclose(out, comp_shear_vels)
+
+    # Precomputed moduli are used without being modified
+    assert_allclose(p.comp_shear_vels(comp_shear_mods), comp_shear_vels)
+    assert_allclose(comp_shear_mods, p.comp_shear_mods())
+
+
+def test_comp_shear_props_linear():
+    """Test the shape of complex properties without frequency dependence."""
+    st = site.SoilType('', 18.0, None, 0.05)
+    p = site.Profile([
+        site.Layer(st, 10, 300),
+        site.Layer(st, 0, 900),
+    ])
+    out = np.empty((2, 1), dtype=complex)
+    assert p.comp_shear_vels(out=out) is out
+    assert_allclose(out[:, 0], [layer.comp_shear_vel for layer in p])
+
+
+def test_soil_type_callable():
+    """Test the soil type update process with callable properties."""
+    st = site.SoilType('', 18.0, lambda s: 0.5, lambda s: 0.05)
+    layer = site.Layer(st, 2., 500.)
+    layer.strain = 0.001
+
+    assert_allclose(layer.shear_mod, 0.5 * layer.initial_shear_mod)
+    assert_allclose(layer.damping, 0.05)